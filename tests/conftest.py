@@ -0,0 +1,7 @@
+import os
+
+
+def pytest_configure(config):
+    # Let numba (used by aeon) reuse its compiled functions across sessions and xdist workers
+    if config.cache is not None:
+        os.environ.setdefault("NUMBA_CACHE_DIR", str(config.cache.mkdir("numba")))
@@ -1,4 +1,5 @@
 import pathlib
+from concurrent.futures import ThreadPoolExecutor
 import matplotlib.pyplot as plt
 import seaborn as sns
 import pandas as pd
@@ -6,9 +7,11 @@ import numpy as np
 
 UCR_ARCHIVE_PATH = pathlib.Path('../../DATA/ucr')
 BENCHMARKS_DS = ["ACSF1", "Adiac", "Beef", "CBF", "ChlorineConcentration", "CinCECGTorso", "CricketX", "DiatomSizeReduction", "DistalPhalanxOutlineCorrect", "ECG200", "EthanolLevel", "FreezerRegularTrain", "FreezerSmallTrain", "Ham", "Haptics", "HouseTwenty", "ItalyPowerDemand", "MixedShapesSmallTrain", "NonInvasiveFetalECGThorax1", "ShapesAll", "Strawberry", "UWaveGestureLibraryX", "Wafer"]
+BENCHMARKS_DS_SET = frozenset(BENCHMARKS_DS)
 
 def load_benchmark_filtered():
-    benchmark_ds = sorted([x for x in UCR_ARCHIVE_PATH.iterdir() if x.name in BENCHMARKS_DS])
+    # Look up the known benchmark names directly instead of listing the whole archive
+    benchmark_ds = sorted(UCR_ARCHIVE_PATH / name for name in BENCHMARKS_DS_SET if (UCR_ARCHIVE_PATH / name).is_dir())
     return benchmark_ds
 
 def load_benchmark():
@@ -17,29 +20,53 @@ def load_benchmark():
 
 DATASETS_PATH = load_benchmark_filtered()
 
+def _tsv_shape(path, chunk_size=1 << 20):
+    # Only the shape is needed: the first row gives the columns and the remaining newlines are counted
+    # over fixed-size chunks, so memory stays constant whatever the file size
+    with open(path, "rb") as f:
+        first = f.readline()
+        if not first.rstrip(b"\r\n"):
+            return 0, 0
+        n_cols = first.count(b"\t") + 1
+        n_rows = 1
+        last = b"\n"
+        while chunk := f.read(chunk_size):
+            n_rows += chunk.count(b"\n")
+            last = chunk[-1:]
+    # The last row may not be terminated by a newline
+    if last != b"\n":
+        n_rows += 1
+    return n_rows, n_cols
+
+def _dataset_stats(dataset):
+    n_train, n_cols = _tsv_shape(dataset / f"{dataset.name}_TRAIN.tsv")
+    n_test, _ = _tsv_shape(dataset / f"{dataset.name}_TEST.tsv")
+    # Train size, Test size, Time series length (first column is the label)
+    return n_train, n_test, n_cols - 1
+
 def draw_scatter_ucr():
     
     ucr_datasets = sorted([x for x in UCR_ARCHIVE_PATH.iterdir() if x.is_dir()])
     ucr_info = np.zeros((len(ucr_datasets), 3), dtype=int)
-    is_benchmark = np.empty(len(ucr_datasets), dtype=str)
+    is_benchmark = np.zeros(len(ucr_datasets), dtype=bool)
 
-    for i, dataset in enumerate(ucr_datasets):
-        train = np.loadtxt(dataset / f"{dataset.name}_TRAIN.tsv", delimiter="\t")
-        test = np.loadtxt(dataset / f"{dataset.name}_TEST.tsv", delimiter="\t")
-        X_train, _ = train[:, 1:], train[:, 0]
-        X_test, _ = test[:, 1:], test[:, 0]
+    # The chunked reads release the GIL, so reads of different datasets overlap
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        stats = list(executor.map(_dataset_stats, ucr_datasets))
 
-        X = np.vstack((X_train, X_test))
-        ucr_info[i] = [X_train.shape[0], X_test.shape[0], X.shape[1]]  # Total number of time series, Time series length, Time series length - 1
-        is_benchmark[i] = "Benchmarked" if dataset.name in BENCHMARKS_DS else "Non-benchmarked"
-    df = pd.DataFrame(np.column_stack([np.where(is_benchmark=='B')[0]+1, ucr_info[np.where(is_benchmark=='B')[0]]]), columns=["ID", "Train Size", "Test Size", "Time Series Length"], index=[ds.name for ds in DATASETS_PATH])
+    for i, dataset in enumerate(ucr_datasets):
+        ucr_info[i] = stats[i]
+        is_benchmark[i] = dataset.name in BENCHMARKS_DS_SET
+    idx = np.flatnonzero(is_benchmark)
+    df = pd.DataFrame(np.column_stack([idx+1, ucr_info[is_benchmark]]), columns=["ID", "Train Size", "Test Size", "Time Series Length"], index=[ds.name for ds in DATASETS_PATH])
     df.to_latex("ucr_dataset_info.tex", index=True, float_format="%.0f", escape=False, column_format="lcccc", label='tab:ucr_datasets_info', caption="UCR Dataset Information. The table shows the number of time series in the training and test sets, as well as the length of the time series for each dataset.")
     # Create the scatter plot
     ds_size = ucr_info[:, :2].sum(axis=1)
-    data = pd.DataFrame({"Dataset size": ds_size, "Time series Length": ucr_info[:, 2], "Benchmark Status": is_benchmark})
+    non_benchmark = pd.DataFrame({"Dataset size": ds_size[~is_benchmark], "Time series Length": ucr_info[~is_benchmark, 2]})
+    benchmark = pd.DataFrame({"Dataset size": ds_size[is_benchmark], "Time series Length": ucr_info[is_benchmark, 2]})
 
-    sns.scatterplot(data=data[data["Benchmark Status"]=="N"], x='Dataset size', y='Time series Length', label='Non-Benchmarked', marker='o')
-    sns.scatterplot(data=data[data["Benchmark Status"]=="B"], x='Dataset size', y='Time series Length', label='Benchmarked', marker='x', linewidth=2)
+    sns.scatterplot(data=non_benchmark, x='Dataset size', y='Time series Length', label='Non-Benchmarked', marker='o')
+    sns.scatterplot(data=benchmark, x='Dataset size', y='Time series Length', label='Benchmarked', marker='x', linewidth=2)
 
     plt.xscale("log")
     plt.yscale("log")
@@ -47,31 +74,14 @@ def draw_scatter_ucr():
     plt.ylabel("Time series Length (log scale)")
     plt.legend()
     plt.title("UCR Archive Datasets")
-    flag = True
-    for i in range(len(ucr_datasets)):
-        if is_benchmark[i] == "B":
-            if i not in [43, 44]:  # Exclude the last two datasets for clarity
-                plt.text(
-                    ds_size[i],
-                    ucr_info[i, 2],
-                    str(i+1),
-                    ha = 'center',
-                    va = 'top',
-                    color = 'black',
-                    fontsize=6,
-                )
-            else:
-                if flag:
-                    plt.text(
-                        ds_size[i],
-                        ucr_info[i, 2],
-                        f"[44-45]",
-                        ha = 'center',
-                        va = 'top',
-                        color = 'black',
-                        fontsize=6,
-                    )
-                    flag = False
+    # Datasets 44 and 45 overlap in the plot, so they share a single label
+    labels = [(ds_size[i], ucr_info[i, 2], str(i+1)) for i in idx if i not in (43, 44)]
+    merged = [i for i in idx if i in (43, 44)]
+    if merged:
+        labels.append((ds_size[merged[0]], ucr_info[merged[0], 2], "[44-45]"))
+    ax = plt.gca()
+    for x, y, label in labels:
+        ax.annotate(label, (x, y), ha='center', va='top', color='black', fontsize=6)
 
     plt.savefig("benchmark_datasets.svg", dpi=300)
 
@@ -13,103 +13,211 @@ from aeon.distances import (
     adtw_pairwise_distance,
     twe_pairwise_distance,
 )
-import time
+import csv
+from datetime import datetime
+from functools import cache
+from time import perf_counter_ns
 import pandas as pd
 TSDISTANCES = [erp_distance, dtw_distance, adtw_distance]
 AEONDISTANCES = [erp_pairwise_distance, dtw_pairwise_distance, adtw_pairwise_distance]
 MODALITIES = ["", "par", "gpu"]
 NUM_RUNS = 1  # Number of times to run each benchmark
+MIN_RUN_TIME_NS = 100_000_000  # Repeat each measured call until at least this much time has elapsed
+SYN_DATASETS = [
+    ("SYN_SMALL", 16, 16, 64),
+    ("SYN_MEDIUM", 32, 32, 128),
+    ("SYN_LONG", 16, 16, 256),
+]  # Name, train size, test size, series length
 
 
 def generate_benchmark(seed=0):
     rng = np.random.default_rng(seed)
     datasets = []
-    for name, n_train, n_test, length in [
-        ("SYN_SMALL", 16, 16, 64),
-        ("SYN_MEDIUM", 32, 32, 128),
-        ("SYN_LONG", 16, 16, 256),
-    ]:
-        X_train = rng.normal(size=(n_train, length))
-        X_test = rng.normal(size=(n_test, length))
+    for name, n_train, n_test, length in SYN_DATASETS:
+        X_train = rng.standard_normal((n_train, length))
+        X_test = rng.standard_normal((n_test, length))
         datasets.append((name, X_train, X_test))
     return datasets
 
 
 DATASETS = generate_benchmark()
 
+
+def _time_call(fn, *args, **kwargs):
+    # Returns the last result and the mean time per call (s), repeating short calls
+    # so that timer resolution does not dominate the measurement
+    n_calls = 0
+    start = perf_counter_ns()
+    while True:
+        result = fn(*args, **kwargs)
+        n_calls += 1
+        elapsed = perf_counter_ns() - start
+        if elapsed >= MIN_RUN_TIME_NS:
+            return result, elapsed * 1e-9 / n_calls
+
+
+@cache
+def has_gpu():
+    # Probing the GPU is expensive when it is missing, so the answer is computed once per session
+    try:
+        dtw_distance(np.zeros((2, 4)), np.zeros((2, 4)), device="gpu")
+    except (KeyboardInterrupt, SystemExit):
+        raise
+    except BaseException:
+        # A failed device setup is a Rust panic, raised as pyo3_runtime.PanicException (a BaseException)
+        return False
+    return True
+
+
+_WARMED = set()
+
+
+def _warmup(dist, device):
+    # Thread pools, GPU contexts/kernels and aeon's numba JIT are set up on the first call,
+    # so each (distance, device) pair is only warmed up once per session
+    key = (dist.__name__, device)
+    if key in _WARMED:
+        return
+    X = np.zeros((2, 8))
+    if device == "gpu":
+        dist(X, X, device="gpu")
+    elif device == "aeon":
+        dist(X, X)
+    else:
+        dist(X, X, par=device == "par")
+    _WARMED.add(key)
+
+
+def _mean_std(times):
+    # With a single run there is nothing to reduce
+    if len(times) == 1:
+        return float(times[0]), 0.0
+    return times.mean(), times.std()
+
+
 def test_tsdistances():
-    tsdistances_times = np.full((len(DATASETS), len(TSDISTANCES), len(MODALITIES), NUM_RUNS), np.nan)
+    # Without a GPU its modality is dropped instead of being kept as a slice of NaNs
+    modalities = MODALITIES if has_gpu() else MODALITIES[:-1]
+    tsdistances_times = np.full((len(DATASETS), len(TSDISTANCES), len(modalities), NUM_RUNS), np.nan)
     aeon_times = np.full((len(DATASETS), len(TSDISTANCES), NUM_RUNS), np.nan)
 
-    for i, (name, X_train, X_test) in enumerate(DATASETS):
-        print(f"\nDataset: {name}")
+    # Line-buffered append-only log, so every row is on disk even if the sweep is interrupted;
+    # rows are tagged with the session start time so that repeated sessions can be told apart
+    session = datetime.now().isoformat(timespec="seconds")
+    with open("times_all.csv", "a", newline="", buffering=1) as f:
+        writer = csv.writer(f)
+        if f.tell() == 0:
+            writer.writerow(["session", "dataset", "library", "distance", "modality", "run", "time"])
 
-        for j, (tsdist, aeondist) in enumerate(zip(TSDISTANCES, AEONDISTANCES)):
-            # Create small subset for warmup
-            X_train_warmup = X_train[:min(10, len(X_train))]
-            X_test_warmup = X_test[:min(10, len(X_test))]
-            
-            # Warmup run
-            _ = tsdist(X_train_warmup, X_test_warmup, par=False)
+        for i, (name, X_train, X_test) in enumerate(DATASETS):
+            print(f"\nDataset: {name}")
+
+            # Convert once to the layout the extension expects and share it across all distances
+            X_train = np.ascontiguousarray(X_train, dtype=np.float64)
+            X_test = np.ascontiguousarray(X_test, dtype=np.float64)
+
+            for j, (tsdist, aeondist) in enumerate(zip(TSDISTANCES, AEONDISTANCES)):
+                run_gpu = tsdist.__name__ != "euclidean_distance" and has_gpu()
+
+                # Warmup run
+                _warmup(tsdist, "seq")
             
-            # Single-threaded runs
-            for run in range(NUM_RUNS):
-                start = time.time()
-                D = tsdist(X_train, X_test, par=False)
-                end = time.time()
-                tsdistances_times[i, j, 0, run] = end - start
-
-            # Warmup parallel
-            _ = tsdist(X_train_warmup, X_test_warmup, par=True)
+                # Single-threaded runs
+                for run in range(NUM_RUNS):
+                    D, tsdistances_times[i, j, 0, run] = _time_call(tsdist, X_train, X_test, par=False)
+
+                # Warmup parallel
+                _warmup(tsdist, "par")
             
-            # Parallel runs
-            for run in range(NUM_RUNS):
-                start = time.time()
-                D_par = tsdist(X_train, X_test, par=True)
-                end = time.time()
-                tsdistances_times[i, j, 1, run] = end - start
-
-            # GPU runs (if supported)
-            if tsdist.__name__ != "euclidean_distance":
-                # Warmup GPU
-                _ = tsdist(X_train_warmup, X_test_warmup, device='gpu')
-                
+                # Parallel runs
                 for run in range(NUM_RUNS):
-                    start = time.time()
-                    D_gpu = tsdist(X_train, X_test, device='gpu')
-                    end = time.time()
-                    tsdistances_times[i, j, 2, run] = end - start
+                    D_par, tsdistances_times[i, j, 1, run] = _time_call(tsdist, X_train, X_test, par=True)
+
+                # GPU runs (if supported)
+                if run_gpu:
+                    # Warmup GPU
+                    _warmup(tsdist, "gpu")
+                
+                    for run in range(NUM_RUNS):
+                        D_gpu, tsdistances_times[i, j, 2, run] = _time_call(tsdist, X_train, X_test, device='gpu')
 
-            # AEON distances - warmup
-            _ = aeondist(X_train_warmup, X_test_warmup)
+                # AEON distances - warmup
+                _warmup(aeondist, "aeon")
             
-            for run in range(NUM_RUNS):
-                start = time.time()
-                D_aeon = aeondist(X_train, X_test)
-                end = time.time()
-                aeon_times[i, j, run] = end - start
-
-            # Print statistics
-            mean_single = np.mean(tsdistances_times[i, j, 0, :])
-            std_single = np.std(tsdistances_times[i, j, 0, :])
-            mean_par = np.mean(tsdistances_times[i, j, 1, :])
-            std_par = np.std(tsdistances_times[i, j, 1, :])
-            mean_aeon = np.mean(aeon_times[i, j, :])
-            std_aeon = np.std(aeon_times[i, j, :])
+                for run in range(NUM_RUNS):
+                    D_aeon, aeon_times[i, j, run] = _time_call(aeondist, X_train, X_test)
+
+                # Print statistics
+                mean_single, std_single = _mean_std(tsdistances_times[i, j, 0, :])
+                mean_par, std_par = _mean_std(tsdistances_times[i, j, 1, :])
+                mean_aeon, std_aeon = _mean_std(aeon_times[i, j, :])
             
-            gpu_str = ""
-            if tsdist.__name__ != "euclidean_distance":
-                mean_gpu = np.mean(tsdistances_times[i, j, 2, :])
-                std_gpu = np.std(tsdistances_times[i, j, 2, :])
-                gpu_str = f", {mean_gpu:.4f}±{std_gpu:.4f} (gpu)"
+                gpu_str = ""
+                if run_gpu:
+                    mean_gpu, std_gpu = _mean_std(tsdistances_times[i, j, 2, :])
+                    gpu_str = f", {mean_gpu:.4f}±{std_gpu:.4f} (gpu)"
             
-            print(f"\t{tsdist.__name__}:")
-            print(f"\t\tSingle: {mean_single:.4f}±{std_single:.4f} (s)")
-            print(f"\t\tParallel: {mean_par:.4f}±{std_par:.4f} (s){gpu_str}")
-            print(f"\t\tAEON: {mean_aeon:.4f}±{std_aeon:.4f} (s)")
+                print(f"\t{tsdist.__name__}:")
+                print(f"\t\tSingle: {mean_single:.4f}±{std_single:.4f} (s)")
+                print(f"\t\tParallel: {mean_par:.4f}±{std_par:.4f} (s){gpu_str}")
+                print(f"\t\tAEON: {mean_aeon:.4f}±{std_aeon:.4f} (s)")
+
+                # D_aeon is not used afterwards, so the difference is computed in place
+                np.subtract(D, D_aeon, out=D_aeon)
+                np.abs(D_aeon, out=D_aeon)
+                max_err = D_aeon.max()
+                # Written as a negated <= so that a NaN in either result still triggers the warning
+                if not max_err <= 1e-8:
+                    print(f"\t\tWARNING: AEON and tsdistances results do not match (max |Δ| = {max_err:.2e})")
+
+                # Stream the timings as they are measured, one row per run
+                for m, modality in enumerate(modalities):
+                    if m == 2 and not run_gpu:
+                        continue
+                    for run in range(NUM_RUNS):
+                        writer.writerow([session, name, "tsdistances", tsdist.__name__, modality or "seq", run, tsdistances_times[i, j, m, run]])
+                for run in range(NUM_RUNS):
+                    writer.writerow([session, name, "aeon", aeondist.__name__, "seq", run, aeon_times[i, j, run]])
+
+    # Replaces the former times_tsdistances_all.npy / times_aeon_all.npy outputs,
+    # now stored under the "tsdistances" and "aeon" keys
+    np.savez_compressed(
+        "times_all.npz",
+        session=np.array(session),
+        tsdistances=tsdistances_times,
+        aeon=aeon_times,
+        datasets=np.array([name for name, _, _ in DATASETS]),
+        modalities=np.array(modalities),
+    )
+
+
+class _PanicException(BaseException):
+    # Stand-in for pyo3_runtime.PanicException, which cannot be imported directly
+    pass
+
+
+@pytest.mark.parametrize("exc, expected", [(_PanicException, False), (ValueError, False), (None, True)])
+def test_has_gpu(monkeypatch, exc, expected):
+    def probe(*args, **kwargs):
+        if exc is not None:
+            raise exc("GPU unavailable")
+
+    monkeypatch.setitem(globals(), "dtw_distance", probe)
+    has_gpu.cache_clear()
+    try:
+        assert has_gpu() is expected
+    finally:
+        has_gpu.cache_clear()
+
 
-            if not np.allclose(D, D_aeon, atol=1e-8):
-                print("\t\tWARNING: AEON and tsdistances results do not match")
+def test_has_gpu_propagates_interrupt(monkeypatch):
+    def probe(*args, **kwargs):
+        raise KeyboardInterrupt
 
-            np.save("times_tsdistances_all.npy", tsdistances_times)
-            np.save("times_aeon_all.npy", aeon_times)
+    monkeypatch.setitem(globals(), "dtw_distance", probe)
+    has_gpu.cache_clear()
+    try:
+        with pytest.raises(KeyboardInterrupt):
+            has_gpu()
+    finally:
+        has_gpu.cache_clear()
@@ -21,10 +21,17 @@ except Exception:  # pragma: no cover - env dependent
 stumpy = pytest.importorskip("stumpy")
 
 N_SAMPLES = 10
-A = np.loadtxt("tests/ACSF1/ACSF1_TRAIN.tsv", delimiter="\t")[:N_SAMPLES, 1:]
-B = np.loadtxt("tests/ACSF1/ACSF1_TEST.tsv", delimiter="\t")[-N_SAMPLES:, 1:]
 band = 1.0
 
+
+@pytest.fixture(scope="session")
+def ab():
+    # Parsed once per session and shared by every test in the module
+    A = np.loadtxt("tests/ACSF1/ACSF1_TRAIN.tsv", delimiter="\t")[:N_SAMPLES, 1:]
+    B = np.loadtxt("tests/ACSF1/ACSF1_TEST.tsv", delimiter="\t")[-N_SAMPLES:, 1:]
+    return A, B
+
+
 AEON_CASES = [
     (euclidean_distance, {"par": True}, lambda a, b: aeon.euclidean_pairwise_distance(a, b)),
     (erp_distance, {"band": band, "gap_penalty": 0.0, "par": True}, lambda a, b: aeon.erp_pairwise_distance(a, b, g=0.0, window=band)),
@@ -40,13 +47,15 @@ AEON_CASES = [
 ]
 
 @pytest.mark.parametrize("tsdist, ts_kwargs, aeon_fn", AEON_CASES)
-def test_aeon_distances(tsdist, ts_kwargs, aeon_fn):
+def test_aeon_distances(ab, tsdist, ts_kwargs, aeon_fn):
+    A, B = ab
     D = tsdist(A, B, **ts_kwargs)
     aeon_D = aeon_fn(A, B)
     assert np.allclose(D, aeon_D, atol=1e-8)
 
 
-def test_mp_distance():
+def test_mp_distance(ab):
+    A, B = ab
     window = int(0.1 * A.shape[1])
     D = mp_distance(A, window, B, par=True)
     D_stumpy = np.zeros_like(D)
@@ -17,6 +17,10 @@ from tsdistances import (
 )
 
 
+# Shared read-only input for the tests below that only need a short 1-D series
+U = np.array([1.0, 2.0, 3.0])
+U.flags.writeable = False
+
 DISTANCES_CHECK_INPUT = [
     erp_distance,
     lcss_distance,
@@ -89,24 +93,21 @@ PAIRWISE_DISTANCES = [
 
 @pytest.mark.parametrize("dist", DISTANCES_CHECK_INPUT)
 def test_1d_requires_v(dist):
-    u = np.array([1.0, 2.0, 3.0])
     with pytest.raises(ValueError, match="If `u` is 1-D"):
-        dist(u)
+        dist(U)
 
 
 @pytest.mark.parametrize("dist", EUCLIDEAN_LIKE)
 def test_euclidean_like_rejects_1d_without_v(dist):
-    u = np.array([1.0, 2.0, 3.0])
     with pytest.raises(Exception):
-        dist(u)
+        dist(U)
 
 
 @pytest.mark.parametrize("dist", DISTANCES_CHECK_INPUT)
 def test_invalid_u_ndim(dist):
     u = np.zeros((2, 2, 2))
-    v = np.array([1.0, 2.0, 3.0])
     with pytest.raises(ValueError, match="`u` must be 1-D or 2-D"):
-        dist(u, v=v)
+        dist(u, v=U)
 
 
 @pytest.mark.parametrize("dist", DISTANCES_CHECK_INPUT)
@@ -128,10 +129,8 @@ def test_accepts_array_like_inputs(dist):
 @pytest.mark.parametrize("dist", BAND_VALIDATED_DISTANCES)
 @pytest.mark.parametrize("band", [-0.1, 1.1])
 def test_band_out_of_range(dist, band):
-    u = np.array([1.0, 2.0, 3.0])
-    v = np.array([1.0, 2.0, 3.0])
     with pytest.raises(ValueError, match="Sakoe-Chiba band"):
-        dist(u, v, band=band)
+        dist(U, U, band=band)
 
 
 @pytest.mark.parametrize(
@@ -145,18 +144,14 @@ def test_band_out_of_range(dist, band):
     ],
 )
 def test_negative_parameters_raise(dist, kwargs, match):
-    u = np.array([1.0, 2.0, 3.0])
-    v = np.array([1.0, 2.0, 3.0])
     with pytest.raises(ValueError, match=match):
-        dist(u, v, **kwargs)
+        dist(U, U, **kwargs)
 
 
 @pytest.mark.parametrize("dist", DEVICE_VALIDATED_DISTANCES)
 def test_invalid_device(dist):
-    u = np.array([1.0, 2.0, 3.0])
-    v = np.array([1.0, 2.0, 3.0])
     with pytest.raises(ValueError, match="Device must be either 'cpu' or 'gpu'"):
-        dist(u, v, device="tpu")
+        dist(U, U, device="tpu")
 
 
 @pytest.mark.parametrize("dist", DISTANCES_CHECK_INPUT)
@@ -203,6 +198,7 @@ def test_non_contiguous_inputs(dist):
     v = base[:, 1::2]
     u_c = np.ascontiguousarray(u)
     v_c = np.ascontiguousarray(v)
+    assert u.base is base and v.base is base
     if dist is mp_distance:
         d_nc = dist(u, v=v)
         d_c = dist(u_c, v=v_c)
@@ -210,6 +206,8 @@ def test_non_contiguous_inputs(dist):
         d_nc = dist(u, v)
         d_c = dist(u_c, v_c)
     assert np.allclose(d_nc, d_c, atol=1e-8)
+    # The distance must not write into the views it was given
+    assert np.array_equal(u, u_c) and np.array_equal(v, v_c)
 
 
 def test_mp_window_extremes():